@@ -11,7 +11,8 @@
 ║  ✓ Administration avec changement d'admin en 2 étapes                       ║
 ║  ✓ Configuration modifiable (fees, prices)                                  ║
 ║  ✓ Événements pour indexation off-chain                                     ║
-║  ✓ Vues onchain complètes                                                   ║
+║  ✓ Vues onchain et offchain (TZIP-16)                                       ║
+║  ✓ Métadonnées TZIP-16 (contrat) et TZIP-12 (tokens)                        ║
 ║  ✓ Protection burn address                                                  ║
 ║  ✓ Pause d'urgence                                                          ║
 ║  ✓ Limite de supply                                                         ║
@@ -30,12 +31,27 @@ def main():
     # TYPES
     # ═══════════════════════════════════════════════════════════════════════════
     
+    # Données immuables d'un token. Le propriétaire et le prix de vente,
+    # modifiés à chaque transfert/vente, sont dans les big_maps owners et
+    # listings pour ne pas réécrire tout le record.
     token_type: type = sp.record(
-        metadata=sp.string,
+        author=sp.address,
+        royalty_percent=sp.nat,
+        created_at=sp.timestamp
+    )
+    
+    # Métadonnées d'un token au format TZIP-12 (token_info[""] = URI)
+    token_metadata_type: type = sp.record(
+        token_id=sp.nat,
+        token_info=sp.map[sp.string, sp.bytes]
+    )
+    
+    # Vue complète d'un token (get_token)
+    token_view_type: type = sp.record(
+        metadata=sp.bytes,
         author=sp.address,
         owner=sp.address,
-        price=sp.mutez,
-        for_sale=sp.bool,
+        price=sp.option[sp.mutez],  # Some(prix) ssi en vente
         royalty_percent=sp.nat,
         created_at=sp.timestamp
     )
@@ -51,6 +67,51 @@ def main():
         end_date=sp.timestamp,
         active=sp.bool
     )
+
+    # Storage en right comb: les champs les plus lus sont en tête, chaque
+    # niveau de profondeur coûtant un accès de plus dans l'arbre de paires.
+    storage_type: type = sp.record(
+        paused=sp.bool,
+        owners=sp.big_map[sp.nat, sp.address],
+        listings=sp.big_map[sp.nat, sp.mutez],
+        tokens=sp.big_map[sp.nat, token_type],
+        pending_payments=sp.big_map[sp.address, sp.mutez],
+        collected_fees=sp.mutez,
+        platform_fee_percent=sp.nat,
+        min_sale_price=sp.mutez,
+        offers=sp.big_map[sp.nat, sp.map[sp.address, offer_type]],
+        admin=sp.address,
+        next_id=sp.nat,
+        mint_price=sp.mutez,
+        max_supply=sp.nat,
+        max_metadata_length=sp.nat,
+        whitelist_only=sp.bool,
+        whitelist=sp.set[sp.address],
+        auctions=sp.big_map[sp.nat, auction_type],
+        pending_admin=sp.option[sp.address],
+        token_metadata=sp.big_map[sp.nat, token_metadata_type],
+        metadata=sp.big_map[sp.string, sp.bytes]
+    ).layout(
+        ("paused",
+        ("owners",
+        ("listings",
+        ("tokens",
+        ("pending_payments",
+        ("collected_fees",
+        ("platform_fee_percent",
+        ("min_sale_price",
+        ("offers",
+        ("admin",
+        ("next_id",
+        ("mint_price",
+        ("max_supply",
+        ("max_metadata_length",
+        ("whitelist_only",
+        ("whitelist",
+        ("auctions",
+        ("pending_admin",
+        ("token_metadata", "metadata")))))))))))))))))))
+    )
         
     # ═══════════════════════════════════════════════════════════════════════════
     # CONTRAT
@@ -64,22 +125,28 @@ def main():
             mint_price: sp.mutez,
             min_sale_price: sp.mutez,
             max_metadata_length: sp.nat,
-            max_supply: sp.nat
+            max_supply: sp.nat,
+            metadata: sp.big_map[sp.string, sp.bytes]
         ):
             # Validations initiales
             assert platform_fee_percent <= sp.nat(20), "INIT: Fee too high"
             assert max_metadata_length >= sp.nat(10), "INIT: Metadata length too small"
+            assert max_metadata_length <= sp.nat(256), "INIT: Metadata length too large"
             
             # Storage principal
-            self.data.tokens = sp.cast(sp.big_map(), sp.big_map[sp.nat, token_type])
+            self.data.tokens = sp.big_map()
+            self.data.owners = sp.big_map()
+            self.data.listings = sp.big_map()
+            self.data.token_metadata = sp.big_map()
             self.data.next_id = sp.nat(0)
-            self.data.offers = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.map[sp.address, offer_type]])
-            self.data.pending_payments = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.mutez])
+            self.data.offers = sp.big_map()
+            self.data.pending_payments = sp.big_map()
+            # En mutez: les ventes y ajoutent directement des mutez, sans conversion
             self.data.collected_fees = sp.mutez(0)
             
             # Administration
             self.data.admin = admin
-            self.data.pending_admin = sp.cast(None, sp.option[sp.address])
+            self.data.pending_admin = None
             
             # Configuration
             self.data.platform_fee_percent = platform_fee_percent
@@ -88,11 +155,16 @@ def main():
             self.data.max_metadata_length = max_metadata_length
             self.data.max_supply = max_supply
             
+            # Métadonnées contrat (TZIP-16)
+            self.data.metadata = metadata
+            
             # --- AJOUTS WHITELIST & ENCHÈRES ---
-            self.data.whitelist = sp.cast(sp.set(), sp.set[sp.address])
+            self.data.whitelist = set()
             self.data.whitelist_only = False
-            self.data.auctions = sp.cast(sp.big_map(), sp.big_map[sp.nat, auction_type])
+            self.data.auctions = sp.big_map()
             self.data.paused = False
+            
+            sp.cast(self.data, storage_type)
         
         # ═══════════════════════════════════════════════════════════════════════
         # FONCTIONS PRIVÉES
@@ -104,57 +176,87 @@ def main():
             recipient = params.recipient
             amount = params.amount
             if amount > sp.mutez(0):
-                if recipient in self.data.pending_payments:
-                    self.data.pending_payments[recipient] += amount
-                else:
-                    self.data.pending_payments[recipient] = amount
+                self.data.pending_payments[recipient] = (
+                    self.data.pending_payments.get(recipient, default=sp.mutez(0)) + amount
+                )
+        
+        @sp.private()
+        def _sale_shares(self, params):
+            """
+            Répartit un prix de vente entre auteur, plateforme et vendeur.
+            
+            La part non-vendeur (royalties + frais) est calculée en une
+            division, puis répartie entre auteur et plateforme au prorata.
+            Le vendeur reçoit le complément (l'arrondi global lui revient),
+            les frais sont le reste de la part non-vendeur.
+            
+            L'auteur peut donc recevoir un peu moins que price * r / 100
+            arrondi: à 150 mutez, 10% royalties et 5% frais, il touche 14
+            mutez au lieu de 15, la plateforme récupère la différence.
+            
+            Fonction pure: le taux de frais est passé par l'appelant, le
+            storage ne transite pas par la lambda.
+            """
+            combined_percent = params.royalty_percent + params.fee_percent
+            non_seller = sp.split_tokens(params.price, combined_percent, sp.nat(100))
+            royalty = sp.mutez(0)
+            if combined_percent > 0:
+                royalty = sp.split_tokens(non_seller, params.royalty_percent, combined_percent)
+            return sp.record(
+                royalty=royalty,
+                fee=non_seller - royalty,
+                seller_amount=params.price - non_seller
+            )
         
         # ═══════════════════════════════════════════════════════════════════════
         # MINTING
         # ═══════════════════════════════════════════════════════════════════════
         
         @sp.entrypoint
-        def mint(self, metadata: sp.string, royalty_percent: sp.nat):
+        def mint(self, metadata: sp.bytes, royalty_percent: sp.nat):
             """
             Crée un nouveau NFT.
             
             Args:
-                metadata: URI IPFS ou données JSON
+                metadata: URI IPFS (en bytes) du JSON de métadonnées
                 royalty_percent: Pourcentage de royalties (0-50%)
             
             Requires:
                 - Contrat non pausé
                 - Montant exact = mint_price
-                - Métadonnées non vides et <= max_length
+                - Métadonnées non vides et <= max_length (256 octets au plus)
                 - Royalties <= 50%
                 - Supply non atteinte
             """
             # Vérifications
             if self.data.whitelist_only:
-                assert self.data.whitelist.contains(sp.sender), "MINT: Not whitelisted"
+                assert sp.sender in self.data.whitelist, "MINT: Not whitelisted"
             assert not self.data.paused, "MINT: Contract paused"
             assert sp.amount == self.data.mint_price, "MINT: Invalid amount"
-            assert sp.len(metadata) > sp.nat(0), "MINT: Empty metadata"
-            assert sp.len(metadata) <= self.data.max_metadata_length, "MINT: Metadata too long"
+            metadata_length = sp.len(metadata)
+            assert metadata_length > sp.nat(0), "MINT: Empty metadata"
+            assert metadata_length <= self.data.max_metadata_length, "MINT: Metadata too long"
             assert royalty_percent <= sp.nat(50), "MINT: Royalty too high"
             
-            # Vérifier supply
-            if self.data.max_supply > sp.nat(0):
-                assert self.data.next_id < self.data.max_supply, "MINT: Max supply reached"
+            # Vérifier supply (valeurs lues une seule fois dans le storage)
+            token_id = self.data.next_id
+            max_supply = self.data.max_supply
+            if max_supply > sp.nat(0):
+                assert token_id < max_supply, "MINT: Max supply reached"
             
             # Créer le token
-            token_id = self.data.next_id
             self.data.tokens[token_id] = sp.record(
-                metadata=metadata,
                 author=sp.sender,
-                owner=sp.sender,
-                price=sp.mutez(0),
-                for_sale=False,
                 royalty_percent=royalty_percent,
                 created_at=sp.now
             )
+            self.data.owners[token_id] = sp.sender
+            self.data.token_metadata[token_id] = sp.record(
+                token_id=token_id,
+                token_info={"": metadata}
+            )
             
-            self.data.next_id += 1
+            self.data.next_id = token_id + 1
             self.data.collected_fees += sp.amount
             
             # Événement
@@ -187,16 +289,13 @@ def main():
             """
             assert not self.data.paused, "LIST: Contract paused"
             assert sp.amount == sp.mutez(0), "LIST: No tez expected"
-            assert token_id in self.data.tokens, "LIST: Token not found"
+            owner = self.data.owners.get(token_id, error="LIST: Token not found")
             assert price >= self.data.min_sale_price, "LIST: Price below minimum"
             
-            token = self.data.tokens[token_id]
-            assert token.owner == sp.sender, "LIST: Not owner"
-            assert not token.for_sale, "LIST: Already listed"
+            assert owner == sp.sender, "LIST: Not owner"
+            assert not token_id in self.data.listings, "LIST: Already listed"
             
-            token.price = price
-            token.for_sale = True
-            self.data.tokens[token_id] = token
+            self.data.listings[token_id] = price
             
             sp.emit(sp.record(
                 token_id=token_id,
@@ -209,16 +308,12 @@ def main():
             """Met à jour le prix d'un token en vente."""
             assert not self.data.paused, "UPDATE: Contract paused"
             assert sp.amount == sp.mutez(0), "UPDATE: No tez expected"
-            assert token_id in self.data.tokens, "UPDATE: Token not found"
+            owner = self.data.owners.get(token_id, error="UPDATE: Token not found")
             assert new_price >= self.data.min_sale_price, "UPDATE: Price below minimum"
             
-            token = self.data.tokens[token_id]
-            assert token.owner == sp.sender, "UPDATE: Not owner"
-            assert token.for_sale, "UPDATE: Not listed"
-            
-            old_price = token.price
-            token.price = new_price
-            self.data.tokens[token_id] = token
+            assert owner == sp.sender, "UPDATE: Not owner"
+            old_price = self.data.listings.get(token_id, error="UPDATE: Not listed")
+            self.data.listings[token_id] = new_price
             
             sp.emit(sp.record(
                 token_id=token_id,
@@ -230,15 +325,11 @@ def main():
         def cancel_sale(self, token_id: sp.nat):
             """Annule la mise en vente d'un NFT."""
             assert sp.amount == sp.mutez(0), "CANCEL: No tez expected"
-            assert token_id in self.data.tokens, "CANCEL: Token not found"
+            owner = self.data.owners.get(token_id, error="CANCEL: Token not found")
+            assert owner == sp.sender, "CANCEL: Not owner"
+            assert token_id in self.data.listings, "CANCEL: Not listed"
             
-            token = self.data.tokens[token_id]
-            assert token.owner == sp.sender, "CANCEL: Not owner"
-            assert token.for_sale, "CANCEL: Not listed"
-            
-            token.for_sale = False
-            token.price = sp.mutez(0)
-            self.data.tokens[token_id] = token
+            del self.data.listings[token_id]
             
             sp.emit(sp.record(token_id=token_id, seller=sp.sender), tag="Cancelled")
         
@@ -256,37 +347,39 @@ def main():
             - Frais de plateforme
             - Reste au vendeur
             
-            Tous les paiements vont en pending (pull pattern).
+            Tous les paiements vont en pending (pull pattern): l'achat
+            n'émet aucune opération, les transferts se font dans withdraw().
             """
             assert not self.data.paused, "BUY: Contract paused"
-            assert token_id in self.data.tokens, "BUY: Token not found"
-            
-            token = self.data.tokens[token_id]
-            assert token.for_sale, "BUY: Not for sale"
-            assert sp.sender != token.owner, "BUY: Cannot buy own token"
-            assert sp.amount == token.price, "BUY: Wrong amount"
+            seller_addr = self.data.owners.get(token_id, error="BUY: Token not found")
+            sale_price = self.data.listings.get(token_id, error="BUY: Not for sale")
+            assert sp.sender != seller_addr, "BUY: Cannot buy own token"
+            assert sp.amount == sale_price, "BUY: Wrong amount"
             
             # Calculer distribution
-            royalty = sp.split_tokens(token.price, token.royalty_percent, sp.nat(100))
-            fee = sp.split_tokens(token.price, self.data.platform_fee_percent, sp.nat(100))
-            seller_amount = token.price - royalty - fee
+            token = self.data.tokens[token_id]
+            shares = self._sale_shares(sp.record(
+                price=sale_price,
+                royalty_percent=token.royalty_percent,
+                fee_percent=self.data.platform_fee_percent
+            ))
+            royalty = shares.royalty
+            fee = shares.fee
+            seller_amount = shares.seller_amount
             
-            # Sauvegarder avant modification
             author_addr = token.author
-            seller_addr = token.owner
-            sale_price = token.price
             
             # Transférer propriété
-            token.owner = sp.sender
-            token.for_sale = False
-            token.price = sp.mutez(0)
-            self.data.tokens[token_id] = token
+            self.data.owners[token_id] = sp.sender
+            del self.data.listings[token_id]
             
-            # Distribuer (pull pattern)
-            self.data.collected_fees += fee
+            # Distribuer (pull pattern), en sautant les parts nulles
+            if fee > sp.mutez(0):
+                self.data.collected_fees += fee
             
             if author_addr != seller_addr:
-                self._add_pending(sp.record(recipient=author_addr, amount=royalty))
+                if royalty > sp.mutez(0):
+                    self._add_pending(sp.record(recipient=author_addr, amount=royalty))
                 self._add_pending(sp.record(recipient=seller_addr, amount=seller_amount))
             else:
                 # Auteur = vendeur: combine les deux
@@ -317,12 +410,10 @@ def main():
             Le montant de l'offre = tez envoyés.
             """
             assert not self.data.paused, "OFFER: Contract paused"
-            assert token_id in self.data.tokens, "OFFER: Token not found"
+            owner = self.data.owners.get(token_id, error="OFFER: Token not found")
             assert duration_seconds > 0, "OFFER: Invalid duration"
             assert sp.amount >= self.data.min_sale_price, "OFFER: Amount too low"
-            
-            token = self.data.tokens[token_id]
-            assert sp.sender != token.owner, "OFFER: Cannot offer on own token"
+            assert sp.sender != owner, "OFFER: Cannot offer on own token"
             
             # Créer l'offre
             new_offer = sp.record(
@@ -330,19 +421,17 @@ def main():
                 expires_at=sp.add_seconds(sp.now, duration_seconds)
             )
             
+            # Map d'offres du token (vide si aucune offre)
+            token_offers = self.data.offers.get(
+                token_id, default=sp.cast({}, sp.map[sp.address, offer_type])
+            )
+            
             # Rembourser ancienne offre si existe
-            if token_id in self.data.offers:
-                token_offers = self.data.offers[token_id]
-                if sp.sender in token_offers:
-                    old_offer = token_offers[sp.sender]
-                    self._add_pending(sp.record(recipient=sp.sender, amount=old_offer.amount))
-                token_offers[sp.sender] = new_offer
-                self.data.offers[token_id] = token_offers
-            else:
-                # Créer nouvelle map d'offres pour ce token
-                empty_map = sp.cast({}, sp.map[sp.address, offer_type])
-                empty_map[sp.sender] = new_offer
-                self.data.offers[token_id] = empty_map
+            if sp.sender in token_offers:
+                old_offer = token_offers[sp.sender]
+                self._add_pending(sp.record(recipient=sp.sender, amount=old_offer.amount))
+            token_offers[sp.sender] = new_offer
+            self.data.offers[token_id] = token_offers
             
             sp.emit(sp.record(
                 token_id=token_id,
@@ -355,9 +444,7 @@ def main():
         def cancel_offer(self, token_id: sp.nat):
             """Annule une offre et rembourse via pending."""
             assert sp.amount == sp.mutez(0), "CANCEL_OFFER: No tez expected"
-            assert token_id in self.data.offers, "CANCEL_OFFER: No offers on token"
-            
-            token_offers = self.data.offers[token_id]
+            token_offers = self.data.offers.get(token_id, error="CANCEL_OFFER: No offers on token")
             assert sp.sender in token_offers, "CANCEL_OFFER: No offer from you"
             
             offer = token_offers[sp.sender]
@@ -383,40 +470,42 @@ def main():
             """
             assert not self.data.paused, "ACCEPT: Contract paused"
             assert sp.amount == sp.mutez(0), "ACCEPT: No tez expected"
-            assert token_id in self.data.tokens, "ACCEPT: Token not found"
-            assert token_id in self.data.offers, "ACCEPT: No offers"
+            seller_addr = self.data.owners.get(token_id, error="ACCEPT: Token not found")
+            token_offers = self.data.offers.get(token_id, error="ACCEPT: No offers")
+            assert seller_addr == sp.sender, "ACCEPT: Not owner"
             
-            token = self.data.tokens[token_id]
-            assert token.owner == sp.sender, "ACCEPT: Not owner"
-            
-            token_offers = self.data.offers[token_id]
             assert buyer in token_offers, "ACCEPT: Offer not found"
             
             offer = token_offers[buyer]
             assert sp.now < offer.expires_at, "ACCEPT: Offer expired"
             
             # Calculer distribution
-            royalty = sp.split_tokens(offer.amount, token.royalty_percent, sp.nat(100))
-            fee = sp.split_tokens(offer.amount, self.data.platform_fee_percent, sp.nat(100))
-            seller_amount = offer.amount - royalty - fee
+            token = self.data.tokens[token_id]
+            shares = self._sale_shares(sp.record(
+                price=offer.amount,
+                royalty_percent=token.royalty_percent,
+                fee_percent=self.data.platform_fee_percent
+            ))
+            royalty = shares.royalty
+            fee = shares.fee
+            seller_amount = shares.seller_amount
             
             author_addr = token.author
-            seller_addr = token.owner
             
             # Si token était en vente, retirer
-            token.owner = buyer
-            token.for_sale = False
-            token.price = sp.mutez(0)
-            self.data.tokens[token_id] = token
+            self.data.owners[token_id] = buyer
+            del self.data.listings[token_id]
             
             # Supprimer l'offre
             del token_offers[buyer]
             self.data.offers[token_id] = token_offers
             
-            # Distribuer
-            self.data.collected_fees += fee
+            # Distribuer, en sautant les parts nulles
+            if fee > sp.mutez(0):
+                self.data.collected_fees += fee
             if author_addr != seller_addr:
-                self._add_pending(sp.record(recipient=author_addr, amount=royalty))
+                if royalty > sp.mutez(0):
+                    self._add_pending(sp.record(recipient=author_addr, amount=royalty))
                 self._add_pending(sp.record(recipient=seller_addr, amount=seller_amount))
             else:
                 self._add_pending(sp.record(recipient=seller_addr, amount=seller_amount + royalty))
@@ -429,53 +518,69 @@ def main():
             ), tag="OfferAccepted")
 
         @sp.entrypoint
-        def start_auction(self, token_id, reserve_price, duration_seconds):
+        def start_auction(self, token_id: sp.nat, reserve_price: sp.mutez, duration_seconds: sp.int):
             """Lance une enchère sur un NFT appartenant à l'appelant."""
-            assert token_id in self.data.tokens, "TOKEN_NOT_FOUND"
-            token = self.data.tokens[token_id]
-            assert token.owner == sp.sender, "NOT_OWNER"
-            assert not token.for_sale, "ALREADY_LISTED"
+            owner = self.data.owners.get(token_id, error="TOKEN_NOT_FOUND")
+            assert owner == sp.sender, "NOT_OWNER"
+            assert not token_id in self.data.listings, "ALREADY_LISTED"
             
+            end_date = sp.add_seconds(sp.now, duration_seconds)
             self.data.auctions[token_id] = sp.record(
                 highest_bidder=sp.sender, # Initialisé au vendeur
                 highest_bid=reserve_price,
-                end_date=sp.add_seconds(sp.now, duration_seconds),
+                end_date=end_date,
                 active=True
             )
             
+            sp.emit(sp.record(
+                token_id=token_id,
+                seller=sp.sender,
+                reserve_price=reserve_price,
+                end_date=end_date
+            ), tag="AuctionStarted")
+            
         @sp.entrypoint
-        def bid(self, token_id):
+        def bid(self, token_id: sp.nat):
             """Placer une offre sur une enchère en cours."""
-            assert self.data.auctions.contains(token_id), "NO_AUCTION"
-            auction = self.data.auctions[token_id]
+            auction = self.data.auctions.get(token_id, error="NO_AUCTION")
             assert auction.active, "AUCTION_FINISHED"
             assert sp.now < auction.end_date, "AUCTION_EXPIRED"
             assert sp.amount > auction.highest_bid, "BID_TOO_LOW"
             
             # Rembourser le précédent enchérisseur (Pull Pattern)
-            if auction.highest_bidder != self.data.tokens[token_id].owner:
+            if auction.highest_bidder != self.data.owners[token_id]:
                 self._add_pending(sp.record(recipient=auction.highest_bidder, amount=auction.highest_bid))
             
             auction.highest_bidder = sp.sender
             auction.highest_bid = sp.amount
             self.data.auctions[token_id] = auction
+            
+            sp.emit(sp.record(token_id=token_id, bidder=sp.sender, amount=sp.amount), tag="Bid")
         
         @sp.entrypoint
-        def end_auction(self, token_id):
+        def end_auction(self, token_id: sp.nat):
             """Clôture l'enchère et transfère le NFT au gagnant."""
-            assert self.data.auctions.contains(token_id), "NO_AUCTION"
-            auction = self.data.auctions[token_id]
+            auction = self.data.auctions.get(token_id, error="NO_AUCTION")
             assert sp.now >= auction.end_date, "TOO_EARLY"
             assert auction.active, "ALREADY_CLOSED"
             
             auction.active = False
             self.data.auctions[token_id] = auction
-            
-            if auction.highest_bidder != self.data.tokens[token_id].owner:
+
+            seller_addr = self.data.owners[token_id]
+            if auction.highest_bidder != seller_addr:
                 # On utilise ici la même logique que buy() pour distribuer les royalties/fees
                 # (Je simplifie ici pour l'exemple, mais il faudrait copier le calcul des parts de buy())
-                self.data.tokens[token_id].owner = auction.highest_bidder
-                self._add_pending(sp.record(recipient=sp.sender, amount=auction.highest_bid))
+                self.data.owners[token_id] = auction.highest_bidder
+                del self.data.listings[token_id]
+                # Le produit revient au propriétaire, pas à l'appelant
+                self._add_pending(sp.record(recipient=seller_addr, amount=auction.highest_bid))
+            
+            sp.emit(sp.record(
+                token_id=token_id,
+                winner=auction.highest_bidder,
+                price=auction.highest_bid
+            ), tag="AuctionEnded")
         
         # ═══════════════════════════════════════════════════════════════════════
         # TRANSFERT & BURN
@@ -493,17 +598,14 @@ def main():
             """
             assert not self.data.paused, "TRANSFER: Contract paused"
             assert sp.amount == sp.mutez(0), "TRANSFER: No tez expected"
-            assert token_id in self.data.tokens, "TRANSFER: Token not found"
+            old_owner = self.data.owners.get(token_id, error="TRANSFER: Token not found")
             assert to_ != sp.address("tz1Ke2h7sDdakHJQh8WX4Z372du1KChsksyU"), "TRANSFER: Cannot send to burn address"
             assert to_ != sp.sender, "TRANSFER: Cannot transfer to self"
             
-            token = self.data.tokens[token_id]
-            assert token.owner == sp.sender, "TRANSFER: Not owner"
-            assert not token.for_sale, "TRANSFER: Token is listed"
+            assert old_owner == sp.sender, "TRANSFER: Not owner"
+            assert not token_id in self.data.listings, "TRANSFER: Token is listed"
             
-            old_owner = token.owner
-            token.owner = to_
-            self.data.tokens[token_id] = token
+            self.data.owners[token_id] = to_
             
             sp.emit(sp.record(
                 token_id=token_id,
@@ -519,14 +621,14 @@ def main():
             Rembourse toutes les offres en cours.
             """
             assert sp.amount == sp.mutez(0), "BURN: No tez expected"
-            assert token_id in self.data.tokens, "BURN: Token not found"
-            
-            token = self.data.tokens[token_id]
-            assert token.owner == sp.sender, "BURN: Not owner"
-            assert not token.for_sale, "BURN: Token is listed"
+            owner = self.data.owners.get(token_id, error="BURN: Token not found")
+            assert owner == sp.sender, "BURN: Not owner"
+            assert not token_id in self.data.listings, "BURN: Token is listed"
             
             # Supprimer le token
             del self.data.tokens[token_id]
+            del self.data.owners[token_id]
+            del self.data.token_metadata[token_id]
             
             # Rembourser toutes les offres
             if token_id in self.data.offers:
@@ -549,9 +651,7 @@ def main():
         def withdraw(self):
             """Retire les paiements en attente."""
             assert sp.amount == sp.mutez(0), "WITHDRAW: No tez expected"
-            assert sp.sender in self.data.pending_payments, "WITHDRAW: Nothing pending"
-            
-            amount = self.data.pending_payments[sp.sender]
+            amount = self.data.pending_payments.get(sp.sender, error="WITHDRAW: Nothing pending")
             assert amount > sp.mutez(0), "WITHDRAW: Zero amount"
             
             # Supprimer AVANT d'envoyer (reentrancy protection)
@@ -583,16 +683,19 @@ def main():
         # ADMINISTRATION
         # ═══════════════════════════════════════════════════════════════════════
         @sp.entrypoint
-        def toggle_whitelist_mode(self, whitelist_only):
+        def toggle_whitelist_mode(self, whitelist_only: sp.bool):
             assert sp.sender == self.data.admin, "ADMIN_ONLY"
             self.data.whitelist_only = whitelist_only
+            sp.emit(sp.record(whitelist_only=whitelist_only), tag="WhitelistModeChanged")
 
         @sp.entrypoint
-        def update_whitelist(self, users):
+        def update_whitelist(self, users: sp.list[sp.address]):
             assert sp.sender == self.data.admin, "ADMIN_ONLY"
             for user in users:
-                if self.data.whitelist.contains(user): self.data.whitelist.remove(user)
+                if user in self.data.whitelist: self.data.whitelist.remove(user)
                 else: self.data.whitelist.add(user)
+            sp.emit(sp.record(toggled=users), tag="WhitelistUpdated")
+        
         @sp.entrypoint
         def set_pause(self, paused: sp.bool):
             """Active/désactive la pause."""
@@ -660,48 +763,43 @@ def main():
             sp.emit(sp.record(new_price=new_price), tag="MinSalePriceUpdated")
         
         # ═══════════════════════════════════════════════════════════════════════
-        # VUES ONCHAIN
+        # VUES (ONCHAIN & OFFCHAIN)
         # ═══════════════════════════════════════════════════════════════════════
         
-        @sp.onchain_view
-        def get_token(self, token_id: sp.nat) -> token_type:
+        @sp.offchain_view
+        def get_token(self, token_id: sp.nat) -> token_view_type:
             """Retourne les données complètes d'un token."""
-            assert token_id in self.data.tokens, "VIEW: Token not found"
-            return self.data.tokens[token_id]
+            token = self.data.tokens.get(token_id, error="VIEW: Token not found")
+            return sp.record(
+                metadata=self.data.token_metadata[token_id].token_info[""],
+                author=token.author,
+                owner=self.data.owners[token_id],
+                price=self.data.listings.get_opt(token_id),
+                royalty_percent=token.royalty_percent,
+                created_at=token.created_at
+            )
         
         @sp.onchain_view
         def get_owner(self, token_id: sp.nat) -> sp.address:
             """Retourne le propriétaire d'un token."""
-            assert token_id in self.data.tokens, "VIEW: Token not found"
-            return self.data.tokens[token_id].owner
+            return self.data.owners.get(token_id, error="VIEW: Token not found")
         
-        @sp.onchain_view
+        @sp.offchain_view
         def is_for_sale(self, token_id: sp.nat) -> sp.bool:
             """Vérifie si un token est en vente."""
-            result = False
-            if token_id in self.data.tokens:
-                result = self.data.tokens[token_id].for_sale
-            return result
+            return token_id in self.data.listings
         
         @sp.onchain_view
         def get_price(self, token_id: sp.nat) -> sp.mutez:
             """Retourne le prix (0 si non listé)."""
-            result = sp.mutez(0)
-            if token_id in self.data.tokens:
-                token = self.data.tokens[token_id]
-                if token.for_sale:
-                    result = token.price
-            return result
+            return self.data.listings.get(token_id, default=sp.mutez(0))
         
         @sp.onchain_view
         def get_pending(self, addr: sp.address) -> sp.mutez:
             """Retourne le montant en attente."""
-            result = sp.mutez(0)
-            if addr in self.data.pending_payments:
-                result = self.data.pending_payments[addr]
-            return result
+            return self.data.pending_payments.get(addr, default=sp.mutez(0))
         
-        @sp.onchain_view
+        @sp.offchain_view
         def get_total_supply(self) -> sp.nat:
             """Retourne le nombre total de tokens créés."""
             return self.data.next_id
@@ -755,74 +853,76 @@ def test_mint_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(1),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(3)
+        max_supply=sp.nat(3),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
     # SUCCESS 1: Premier mint
     scenario.h2("SUCCESS: Premier mint par Alice")
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=alice, _amount=sp.tez(1))
     scenario.verify(c.data.next_id == 1)
-    scenario.verify(c.data.tokens[0].owner == alice.address)
+    scenario.verify(c.data.owners[0] == alice.address)
     scenario.verify(c.data.tokens[0].author == alice.address)
     scenario.verify(c.data.tokens[0].royalty_percent == 10)
+    scenario.verify(c.data.token_metadata[0].token_info[""] == sp.scenario_utils.bytes_of_string("ipfs://Qm1"))
     scenario.verify(c.data.collected_fees == sp.tez(1))
     
     # SUCCESS 2: Second mint par Bob
     scenario.h2("SUCCESS: Second mint par Bob")
-    c.mint(metadata="ipfs://Qm2", royalty_percent=sp.nat(0),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(0),
            _sender=bob, _amount=sp.tez(1))
     scenario.verify(c.data.next_id == 2)
-    scenario.verify(c.data.tokens[1].owner == bob.address)
+    scenario.verify(c.data.owners[1] == bob.address)
     
     # FAIL 1: Montant incorrect (trop)
     scenario.h2("FAIL: Montant trop élevé")
-    c.mint(metadata="ipfs://Qm3", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm3"), royalty_percent=sp.nat(5),
            _sender=alice, _amount=sp.tez(2),
            _valid=False, _exception="MINT: Invalid amount")
     
     # FAIL 2: Montant incorrect (pas assez)
     scenario.h2("FAIL: Montant insuffisant")
-    c.mint(metadata="ipfs://Qm3", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm3"), royalty_percent=sp.nat(5),
            _sender=alice, _amount=sp.mutez(500000),
            _valid=False, _exception="MINT: Invalid amount")
     
     # FAIL 3: Métadonnées vides
     scenario.h2("FAIL: Métadonnées vides")
-    c.mint(metadata="", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string(""), royalty_percent=sp.nat(5),
            _sender=alice, _amount=sp.tez(1),
            _valid=False, _exception="MINT: Empty metadata")
     
     # FAIL 4: Métadonnées trop longues
     scenario.h2("FAIL: Métadonnées trop longues")
-    long_metadata = "x" * 300  # > 256
+    long_metadata = sp.scenario_utils.bytes_of_string("x" * 300)  # > 256
     c.mint(metadata=long_metadata, royalty_percent=sp.nat(5),
            _sender=alice, _amount=sp.tez(1),
            _valid=False, _exception="MINT: Metadata too long")
     
     # FAIL 5: Royalties trop élevées
     scenario.h2("FAIL: Royalties > 50%")
-    c.mint(metadata="ipfs://Qm3", royalty_percent=sp.nat(51),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm3"), royalty_percent=sp.nat(51),
            _sender=alice, _amount=sp.tez(1),
            _valid=False, _exception="MINT: Royalty too high")
     
     # SUCCESS 3: Troisième mint (dernière place)
     scenario.h2("SUCCESS: Troisième mint (supply=3)")
-    c.mint(metadata="ipfs://Qm3", royalty_percent=sp.nat(25),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm3"), royalty_percent=sp.nat(25),
            _sender=alice, _amount=sp.tez(1))
     scenario.verify(c.data.next_id == 3)
     
     # FAIL 6: Supply max atteinte
     scenario.h2("FAIL: Max supply atteinte")
-    c.mint(metadata="ipfs://Qm4", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm4"), royalty_percent=sp.nat(5),
            _sender=alice, _amount=sp.tez(1),
            _valid=False, _exception="MINT: Max supply reached")
     
     # FAIL 7: Mint quand pausé
     scenario.h2("FAIL: Mint quand pausé")
     c.set_pause(True, _sender=admin)
-    c.mint(metadata="ipfs://Qm5", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm5"), royalty_percent=sp.nat(5),
            _sender=bob, _amount=sp.tez(1),
            _valid=False, _exception="MINT: Contract paused")
     c.set_pause(False, _sender=admin)
@@ -847,26 +947,27 @@ def test_list_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(2),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(0)
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
     # Setup: mint 2 tokens
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=alice, _amount=sp.tez(1))
-    c.mint(metadata="ipfs://Qm2", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(5),
            _sender=bob, _amount=sp.tez(1))
     
     # SUCCESS 1: List token 0
     scenario.h2("SUCCESS: Alice liste token 0")
     c.list_for_sale(token_id=sp.nat(0), price=sp.tez(10), _sender=alice)
-    scenario.verify(c.data.tokens[0].for_sale == True)
-    scenario.verify(c.data.tokens[0].price == sp.tez(10))
+    scenario.verify(c.data.listings.contains(sp.nat(0)))
+    scenario.verify(c.data.listings[0] == sp.tez(10))
     
     # SUCCESS 2: List token 1
     scenario.h2("SUCCESS: Bob liste token 1")
     c.list_for_sale(token_id=sp.nat(1), price=sp.tez(5), _sender=bob)
-    scenario.verify(c.data.tokens[1].for_sale == True)
+    scenario.verify(c.data.listings.contains(sp.nat(1)))
     
     # FAIL 1: Pas propriétaire
     scenario.h2("FAIL: Bob essaie de lister token d'Alice")
@@ -924,23 +1025,24 @@ def test_update_price_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(2),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(0)
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=alice, _amount=sp.tez(1))
     c.list_for_sale(token_id=sp.nat(0), price=sp.tez(10), _sender=alice)
     
     # SUCCESS 1: Update prix
     scenario.h2("SUCCESS: Update prix à 20 tez")
     c.update_price(token_id=sp.nat(0), new_price=sp.tez(20), _sender=alice)
-    scenario.verify(c.data.tokens[0].price == sp.tez(20))
+    scenario.verify(c.data.listings[0] == sp.tez(20))
     
     # SUCCESS 2: Update prix encore
     scenario.h2("SUCCESS: Update prix à 5 tez")
     c.update_price(token_id=sp.nat(0), new_price=sp.tez(5), _sender=alice)
-    scenario.verify(c.data.tokens[0].price == sp.tez(5))
+    scenario.verify(c.data.listings[0] == sp.tez(5))
     
     # FAIL 1: Pas propriétaire
     scenario.h2("FAIL: Bob essaie d'update")
@@ -949,7 +1051,7 @@ def test_update_price_comprehensive():
     
     # FAIL 2: Token non listé
     scenario.h2("FAIL: Token non listé")
-    c.mint(metadata="ipfs://Qm2", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(5),
            _sender=bob, _amount=sp.tez(1))
     c.update_price(token_id=sp.nat(1), new_price=sp.tez(10),
                    _sender=bob, _valid=False, _exception="UPDATE: Not listed")
@@ -979,13 +1081,14 @@ def test_cancel_sale_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(1),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(0)
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=alice, _amount=sp.tez(1))
-    c.mint(metadata="ipfs://Qm2", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(5),
            _sender=bob, _amount=sp.tez(1))
     c.list_for_sale(token_id=sp.nat(0), price=sp.tez(10), _sender=alice)
     c.list_for_sale(token_id=sp.nat(1), price=sp.tez(5), _sender=bob)
@@ -993,13 +1096,12 @@ def test_cancel_sale_comprehensive():
     # SUCCESS 1: Cancel par Alice
     scenario.h2("SUCCESS: Alice annule sa vente")
     c.cancel_sale(sp.nat(0), _sender=alice)
-    scenario.verify(c.data.tokens[0].for_sale == False)
-    scenario.verify(c.data.tokens[0].price == sp.mutez(0))
+    scenario.verify(~c.data.listings.contains(sp.nat(0)))
     
     # SUCCESS 2: Cancel par Bob
     scenario.h2("SUCCESS: Bob annule sa vente")
     c.cancel_sale(sp.nat(1), _sender=bob)
-    scenario.verify(c.data.tokens[1].for_sale == False)
+    scenario.verify(~c.data.listings.contains(sp.nat(1)))
     
     # FAIL 1: Pas propriétaire
     scenario.h2("FAIL: Alice essaie d'annuler vente de Bob")
@@ -1038,13 +1140,14 @@ def test_buy_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(1),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(0)
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=alice, _amount=sp.tez(1))
-    c.mint(metadata="ipfs://Qm2", royalty_percent=sp.nat(20),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(20),
            _sender=bob, _amount=sp.tez(1))
     c.list_for_sale(token_id=sp.nat(0), price=sp.tez(100), _sender=alice)
     c.list_for_sale(token_id=sp.nat(1), price=sp.tez(50), _sender=bob)
@@ -1052,8 +1155,8 @@ def test_buy_comprehensive():
     # SUCCESS 1: Bob achète token 0 d'Alice
     scenario.h2("SUCCESS: Bob achète token 0")
     c.buy(sp.nat(0), _sender=bob, _amount=sp.tez(100))
-    scenario.verify(c.data.tokens[0].owner == bob.address)
-    scenario.verify(c.data.tokens[0].for_sale == False)
+    scenario.verify(c.data.owners[0] == bob.address)
+    scenario.verify(~c.data.listings.contains(sp.nat(0)))
     # Distribution: 10% royalty = 10, 5% fee = 5, seller = 85
     # Alice est author ET seller donc: 85 + 10 = 95
     scenario.verify(c.data.pending_payments[alice.address] == sp.tez(95))
@@ -1062,7 +1165,7 @@ def test_buy_comprehensive():
     # SUCCESS 2: Charlie achète token 1 de Bob
     scenario.h2("SUCCESS: Charlie achète token 1")
     c.buy(sp.nat(1), _sender=charlie, _amount=sp.tez(50))
-    scenario.verify(c.data.tokens[1].owner == charlie.address)
+    scenario.verify(c.data.owners[1] == charlie.address)
     # 20% royalty = 10, 5% fee = 2.5 (arrondi), seller = reste
     
     # FAIL 1: Acheter son propre token
@@ -1114,11 +1217,12 @@ def test_offers_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(1),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(0)
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=alice, _amount=sp.tez(1))
     
     # SUCCESS 1: Bob fait une offre
@@ -1170,11 +1274,16 @@ def test_offers_comprehensive():
     # SUCCESS 5: Alice accepte l'offre de Bob
     scenario.h2("SUCCESS: Alice accepte l'offre de Bob")
     c.accept_offer(token_id=sp.nat(0), buyer=bob.address, _sender=alice)
-    scenario.verify(c.data.tokens[0].owner == bob.address)
+    scenario.verify(c.data.owners[0] == bob.address)
+    # Alice est auteur et vendeuse: 7 tez royalties + 59.5 tez vendeur
+    scenario.verify(c.data.pending_payments[alice.address] == sp.mutez(66500000))
+    scenario.verify(c.data.collected_fees == sp.tez(1) + sp.mutez(3500000))
+    # L'offre acceptée est retirée
+    scenario.verify(~c.data.offers[0].contains(bob.address))
     
     # FAIL 5: Accepter offre inexistante
     scenario.h2("FAIL: Accepter offre inexistante")
-    c.mint(metadata="ipfs://Qm2", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(5),
            _sender=alice, _amount=sp.tez(1))
     c.make_offer(token_id=sp.nat(1), duration_seconds=86400,
                  _sender=charlie, _amount=sp.tez(30))
@@ -1207,25 +1316,26 @@ def test_transfer_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(1),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(0)
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=alice, _amount=sp.tez(1))
-    c.mint(metadata="ipfs://Qm2", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(5),
            _sender=bob, _amount=sp.tez(1))
     
     # SUCCESS 1: Alice transfère à Bob
     scenario.h2("SUCCESS: Alice transfère à Bob")
     c.transfer(token_id=sp.nat(0), to_=bob.address, _sender=alice)
-    scenario.verify(c.data.tokens[0].owner == bob.address)
+    scenario.verify(c.data.owners[0] == bob.address)
     scenario.verify(c.data.tokens[0].author == alice.address)  # Author inchangé
     
     # SUCCESS 2: Bob transfère à Charlie
     scenario.h2("SUCCESS: Bob transfère à Charlie")
     c.transfer(token_id=sp.nat(0), to_=charlie.address, _sender=bob)
-    scenario.verify(c.data.tokens[0].owner == charlie.address)
+    scenario.verify(c.data.owners[0] == charlie.address)
     
     # FAIL 1: Pas propriétaire
     scenario.h2("FAIL: Alice n'est plus propriétaire")
@@ -1275,13 +1385,14 @@ def test_burn_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(1),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(0)
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=alice, _amount=sp.tez(1))
-    c.mint(metadata="ipfs://Qm2", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(5),
            _sender=bob, _amount=sp.tez(1))
     
     # Ajouter des offres sur token 0
@@ -1294,6 +1405,8 @@ def test_burn_comprehensive():
     scenario.h2("SUCCESS: Alice burn token 0 (offres remboursées)")
     c.burn(sp.nat(0), _sender=alice)
     scenario.verify(~c.data.tokens.contains(sp.nat(0)))
+    scenario.verify(~c.data.owners.contains(sp.nat(0)))
+    scenario.verify(~c.data.token_metadata.contains(sp.nat(0)))
     scenario.verify(c.data.pending_payments[bob.address] == sp.tez(50))
     scenario.verify(c.data.pending_payments[charlie.address] == sp.tez(60))
     
@@ -1304,7 +1417,7 @@ def test_burn_comprehensive():
     
     # FAIL 1: Pas propriétaire
     scenario.h2("FAIL: Pas propriétaire")
-    c.mint(metadata="ipfs://Qm3", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm3"), royalty_percent=sp.nat(5),
            _sender=alice, _amount=sp.tez(1))
     c.burn(sp.nat(2), _sender=bob,
            _valid=False, _exception="BURN: Not owner")
@@ -1340,12 +1453,13 @@ def test_withdraw_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(1),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(0)
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
     # Setup: créer des pending payments
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=alice, _amount=sp.tez(1))
     c.list_for_sale(token_id=sp.nat(0), price=sp.tez(100), _sender=alice)
     c.buy(sp.nat(0), _sender=bob, _amount=sp.tez(100))
@@ -1369,7 +1483,7 @@ def test_withdraw_comprehensive():
     
     # FAIL 2: Withdraw fees pas admin
     scenario.h2("FAIL: Withdraw fees - pas admin")
-    c.mint(metadata="ipfs://Qm2", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(5),
            _sender=alice, _amount=sp.tez(1))
     c.withdraw_fees(_sender=alice,
                     _valid=False, _exception="FEES: Not admin")
@@ -1400,7 +1514,8 @@ def test_admin_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(1),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(0)
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
@@ -1502,12 +1617,13 @@ def test_royalties_distribution():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(1),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(0)
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
     # Author crée le NFT
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=author, _amount=sp.tez(1))
     
     # Author transfère à seller
@@ -1541,6 +1657,20 @@ def test_royalties_distribution():
     # Nouvelles royalties: 200 * 10% = 20 tez à author
     # Total author: 10 + 20 = 30 tez
     scenario.verify(c.data.pending_payments[author.address] == sp.tez(30))
+    
+    # Arrondi: la part non-vendeur est répartie au prorata
+    scenario.h2("Arrondi: royalties calculées sur la part non-vendeur")
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(10),
+           _sender=author, _amount=sp.tez(1))
+    c.transfer(token_id=sp.nat(1), to_=seller.address, _sender=author)
+    c.list_for_sale(token_id=sp.nat(1), price=sp.mutez(1000150), _sender=seller)
+    c.buy(sp.nat(1), _sender=buyer, _amount=sp.mutez(1000150))
+    # Part non-vendeur (15%): 150022 mutez, vendeur: 850128 mutez
+    # Royalties: 150022 * 10 / 15 = 100014 mutez (100015 à 10% du prix)
+    # Frais: 150022 - 100014 = 50008 mutez
+    scenario.verify(c.data.pending_payments[author.address] == sp.tez(30) + sp.mutez(100014))
+    scenario.verify(c.data.pending_payments[seller.address] == sp.tez(85) + sp.mutez(850128))
+    scenario.verify(c.data.collected_fees == sp.tez(17) + sp.mutez(50008))
 
 
 # -------------------------------------------------------------------------------
@@ -1562,12 +1692,13 @@ def test_views_comprehensive():
         mint_price=sp.tez(1),
         min_sale_price=sp.tez(2),
         max_metadata_length=sp.nat(256),
-        max_supply=sp.nat(100)
+        max_supply=sp.nat(100),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
     # Mint
-    c.mint(metadata="ipfs://Qm1", royalty_percent=sp.nat(10),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
            _sender=alice, _amount=sp.tez(1))
     
     # Test get_total_supply
@@ -1624,12 +1755,28 @@ def test_views_comprehensive():
     
     # Test get_token
     scenario.h2("VIEW: get_token")
-    c.mint(metadata="ipfs://Qm2", royalty_percent=sp.nat(5),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm2"), royalty_percent=sp.nat(5),
            _sender=bob, _amount=sp.tez(1))
     token = c.get_token(sp.nat(1))
     scenario.verify(token.owner == bob.address)
     scenario.verify(token.author == bob.address)
     scenario.verify(token.royalty_percent == 5)
+    
+    # Test métadonnées TZIP-16
+    scenario.h2("STORAGE: metadata TZIP-16")
+    scenario.verify(c.data.metadata[""] == sp.scenario_utils.bytes_of_string("ipfs://QmMarketplace"))
+    
+    # Test JSON TZIP-16: les vues offchain y sont publiées
+    # (à épingler sur IPFS avec sp.pin_on_ipfs pour l'URI de metadata[""])
+    scenario.h2("TZIP-16: vues offchain")
+    contract_metadata = sp.create_tzip16_metadata(
+        name="NFT Marketplace",
+        interfaces=["TZIP-012"],
+        offchain_views=c.get_offchain_views()
+    )
+    view_names = [view["name"] for view in contract_metadata["views"]]
+    for name in ["get_token", "is_for_sale", "get_total_supply"]:
+        assert name in view_names
 
 
 # -------------------------------------------------------------------------------
@@ -1651,13 +1798,14 @@ def test_edge_cases():
         mint_price=sp.mutez(0),  # Mint gratuit
         min_sale_price=sp.mutez(1),  # Prix minimum très bas
         max_metadata_length=sp.nat(10),  # Très court
-        max_supply=sp.nat(2)  # Très limité
+        max_supply=sp.nat(2),  # Très limité
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
     )
     scenario += c
     
     # Edge 1: Mint gratuit
     scenario.h2("EDGE: Mint gratuit")
-    c.mint(metadata="short", royalty_percent=sp.nat(0),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("short"), royalty_percent=sp.nat(0),
            _sender=alice, _amount=sp.mutez(0))
     scenario.verify(c.data.next_id == 1)
     
@@ -1669,16 +1817,126 @@ def test_edge_cases():
     scenario.verify(c.data.pending_payments[alice.address] == sp.mutez(1000))
     scenario.verify(c.data.collected_fees == sp.mutez(0))
     
+    # Edge 2b: Revente à l'auteur, parts nulles non créditées
+    scenario.h2("EDGE: Royalties et fees nulles non créditées")
+    c.list_for_sale(token_id=sp.nat(0), price=sp.mutez(500), _sender=bob)
+    c.buy(sp.nat(0), _sender=alice, _amount=sp.mutez(500))
+    scenario.verify(c.data.pending_payments[alice.address] == sp.mutez(1000))
+    scenario.verify(c.data.pending_payments[bob.address] == sp.mutez(500))
+    scenario.verify(c.data.collected_fees == sp.mutez(0))
+    
     # Edge 3: Supply max
     scenario.h2("EDGE: Atteindre supply max")
-    c.mint(metadata="short2", royalty_percent=sp.nat(50),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("short2"), royalty_percent=sp.nat(50),
            _sender=bob, _amount=sp.mutez(0))
-    c.mint(metadata="short3", royalty_percent=sp.nat(0),
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("short3"), royalty_percent=sp.nat(0),
            _sender=alice, _amount=sp.mutez(0),
            _valid=False, _exception="MINT: Max supply reached")
     
     # Edge 4: Prix minimum = 1 mutez
     scenario.h2("EDGE: Prix minimum 1 mutez")
     c.list_for_sale(token_id=sp.nat(1), price=sp.mutez(1), _sender=bob)
-    scenario.verify(c.data.tokens[1].price == sp.mutez(1))
+    scenario.verify(c.data.listings[1] == sp.mutez(1))
+    
+    # Edge 5: Arrondi - la poussière ne fait pas perdre le vendeur
+    scenario.h2("EDGE: Arrondi au profit du vendeur")
+    # 1 mutez, 50% royalties: part non-vendeur = 0, vendeur = 1, frais = 0
+    c.buy(sp.nat(1), _sender=alice, _amount=sp.mutez(1))
+    scenario.verify(c.data.pending_payments[bob.address] == sp.mutez(501))
+    scenario.verify(c.data.collected_fees == sp.mutez(0))
+    
+    # Edge 6: Limite de métadonnées au-delà du plafond
+    scenario.h2("EDGE: Origination avec max_metadata_length > 256")
+    try:
+        scenario += main.NFTMarketplace(
+            admin=admin.address,
+            platform_fee_percent=sp.nat(0),
+            mint_price=sp.mutez(0),
+            min_sale_price=sp.mutez(1),
+            max_metadata_length=sp.nat(257),
+            max_supply=sp.nat(0),
+            metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
+        )
+    except sp.FailwithException as e:
+        assert e.value == "INIT: Metadata length too large", e.value
+    else:
+        assert False, "INIT: origination with max_metadata_length=257 should fail"
+
+
+# -------------------------------------------------------------------------------
+# TEST 14: AUCTIONS
+# -------------------------------------------------------------------------------
+@sp.add_test()
+def test_auctions():
+    """Tests pour start_auction, bid, end_auction"""
+    scenario = sp.test_scenario("Auctions", main)
+    scenario.h1("AUCTIONS")
+    
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    charlie = sp.test_account("charlie")
+    
+    c = main.NFTMarketplace(
+        admin=admin.address,
+        platform_fee_percent=sp.nat(5),
+        mint_price=sp.tez(1),
+        min_sale_price=sp.tez(1),
+        max_metadata_length=sp.nat(256),
+        max_supply=sp.nat(0),
+        metadata=sp.scenario_utils.metadata_of_url("ipfs://QmMarketplace")
+    )
+    scenario += c
+    
+    c.mint(metadata=sp.scenario_utils.bytes_of_string("ipfs://Qm1"), royalty_percent=sp.nat(10),
+           _sender=alice, _amount=sp.tez(1))
+    
+    # SUCCESS 1: Alice lance une enchère
+    scenario.h2("SUCCESS: Alice lance une enchère")
+    c.start_auction(token_id=sp.nat(0), reserve_price=sp.tez(10),
+                    duration_seconds=3600, _sender=alice, _now=sp.timestamp(0))
+    scenario.verify(c.data.auctions[0].active == True)
+    
+    # SUCCESS 2: Bob puis Charlie enchérissent
+    scenario.h2("SUCCESS: Bob puis Charlie enchérissent")
+    c.bid(sp.nat(0), _sender=bob, _amount=sp.tez(20), _now=sp.timestamp(10))
+    c.bid(sp.nat(0), _sender=charlie, _amount=sp.tez(30), _now=sp.timestamp(20))
+    scenario.verify(c.data.auctions[0].highest_bidder == charlie.address)
+    # Bob est remboursé en pending
+    scenario.verify(c.data.pending_payments[bob.address] == sp.tez(20))
+    
+    # FAIL 1: Enchère trop basse
+    scenario.h2("FAIL: Enchère trop basse")
+    c.bid(sp.nat(0), _sender=bob, _amount=sp.tez(25), _now=sp.timestamp(30),
+          _valid=False, _exception="BID_TOO_LOW")
+    
+    # FAIL 2: Clôture trop tôt
+    scenario.h2("FAIL: Clôture trop tôt")
+    c.end_auction(sp.nat(0), _sender=alice, _now=sp.timestamp(100),
+                  _valid=False, _exception="TOO_EARLY")
+    
+    # FAIL 3: Enchère expirée
+    scenario.h2("FAIL: Enchère expirée")
+    c.bid(sp.nat(0), _sender=bob, _amount=sp.tez(40), _now=sp.timestamp(3600),
+          _valid=False, _exception="AUCTION_EXPIRED")
+    
+    # SUCCESS 3: Clôture par un tiers, Charlie reçoit le token
+    scenario.h2("SUCCESS: Clôture de l'enchère par un tiers")
+    c.end_auction(sp.nat(0), _sender=bob, _now=sp.timestamp(3600))
+    scenario.verify(c.data.owners[0] == charlie.address)
+    scenario.verify(~c.data.listings.contains(sp.nat(0)))
+    scenario.verify(c.data.auctions[0].active == False)
+    # Le vendeur est crédité, pas l'appelant
+    scenario.verify(c.data.pending_payments[alice.address] == sp.tez(30))
+    scenario.verify(c.data.pending_payments[bob.address] == sp.tez(20))
+    
+    # FAIL 4: Déjà clôturée
+    scenario.h2("FAIL: Enchère déjà clôturée")
+    c.end_auction(sp.nat(0), _sender=alice, _now=sp.timestamp(4000),
+                  _valid=False, _exception="ALREADY_CLOSED")
+    
+    # FAIL 5: Pas d'enchère
+    scenario.h2("FAIL: Pas d'enchère")
+    c.bid(sp.nat(999), _sender=bob, _amount=sp.tez(1),
+          _valid=False, _exception="NO_AUCTION")
 